@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from flask import Flask, request, jsonify
 from flask_cors import CORS
@@ -11,14 +12,16 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize Supabase client
-supabase_url = os.environ.get("SUPABASE_URL")
-supabase_key = os.environ.get("SUPABASE_KEY")
+@lru_cache(maxsize=1)
+def get_supabase() -> Client:
+    """Create the Supabase client on first use and reuse it afterwards"""
+    supabase_url = os.environ.get("SUPABASE_URL")
+    supabase_key = os.environ.get("SUPABASE_KEY")
 
-if not supabase_url or not supabase_key:
-    raise ValueError("Supabase URL and Key must be set in the .env file.")
+    if not supabase_url or not supabase_key:
+        raise ValueError("Supabase URL and Key must be set in the .env file.")
 
-supabase: Client = create_client(supabase_url, supabase_key)
+    return create_client(supabase_url, supabase_key)
 
 @app.route('/')
 def index():
@@ -41,7 +44,7 @@ def create_log():
 
     try:
         # Insert data into the 'telemetry_data' table
-        response = supabase.table('telemetry_data').insert(data).execute()
+        response = get_supabase().table('telemetry_data').insert(data).execute()
         
         # Check for errors in the response
         if response.data:
@@ -58,7 +61,7 @@ def get_latest_data():
     Returns the most recent telemetry data row.
     """
     try:
-        response = supabase.table('telemetry_data').select('*').order('timestamp', desc=True).limit(1).execute()
+        response = get_supabase().table('telemetry_data').select('*').order('timestamp', desc=True).limit(1).execute()
         if response.data:
             return jsonify(response.data[0]), 200
         else:
@@ -74,7 +77,7 @@ def get_logs():
     """
     severity = request.args.get('severity')
     try:
-        query = supabase.table('logs').select('*').order('timestamp', desc=True)
+        query = get_supabase().table('logs').select('*').order('timestamp', desc=True)
         if severity and severity.lower() != 'all':
             query = query.eq('severity', severity)
             
@@ -89,4 +92,5 @@ def get_logs():
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
+    get_supabase()  # Fail fast on missing credentials when run as a server
     app.run(host='0.0.0.0', port=5000, debug=True)
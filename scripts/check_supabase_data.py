@@ -6,6 +6,9 @@ Quick verification script for Raspberry Pi
 
 import os
 import sys
+import traceback
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 # Add backend to path
@@ -17,7 +20,41 @@ except ImportError:
     print("❌ Could not import Supabase storage")
     sys.exit(1)
 
-def check_recent_data():
+class StepResult:
+    """Outcome of a single verification step"""
+    __slots__ = ('ok', 'error')
+    
+    def __init__(self):
+        self.ok = True
+        self.error = None
+
+@contextmanager
+def step(description):
+    """Run a verification step, reporting any error instead of raising it"""
+    result = StepResult()
+    try:
+        yield result
+    except Exception as e:
+        result.ok = False
+        result.error = e
+        print(f"❌ Error {description}: {e}")
+        traceback.print_exc()
+
+def fetch_recent_data():
+    """Query the latest sensor readings"""
+    return supabase_storage.supabase_client.table('sensor_data') \
+        .select('timestamp,vehicle_id,rpm,vehicle_speed,coolant_temp,engine_load') \
+        .order('timestamp', desc=True) \
+        .limit(10) \
+        .execute()
+
+def fetch_vehicles():
+    """Query registered vehicle profiles"""
+    return supabase_storage.supabase_client.table('vehicle_profiles') \
+        .select('id,car_display_name,make,model,total_records') \
+        .execute()
+
+def check_recent_data(recent_future):
     """Check for recent sensor data in Supabase"""
     print("🔍 Checking Supabase for recent OBD data...")
     print("=" * 60)
@@ -29,13 +66,8 @@ def check_recent_data():
     print("✅ Connected to Supabase")
     print()
     
-    try:
-        # Query recent sensor data using supabase_client
-        response = supabase_storage.supabase_client.table('sensor_data') \
-            .select('*') \
-            .order('timestamp', desc=True) \
-            .limit(10) \
-            .execute()
+    with step("querying Supabase") as result:
+        response = recent_future.result()
         
         if not response.data:
             print("⚠️  No data found in sensor_data table")
@@ -82,25 +114,17 @@ def check_recent_data():
                 
             except Exception as e:
                 print(f"⚠️  Could not parse timestamp: {e}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error querying Supabase: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    
+    return result.ok
 
-def check_vehicles():
+def check_vehicles(vehicles_future):
     """Check registered vehicles"""
     print()
     print("🚗 Checking registered vehicles...")
     print("-" * 60)
     
-    try:
-        response = supabase_storage.supabase_client.table('vehicle_profiles') \
-            .select('*') \
-            .execute()
+    with step("checking vehicles"):
+        response = vehicles_future.result()
         
         if not response.data:
             print("⚠️  No vehicles registered yet")
@@ -111,7 +135,7 @@ def check_vehicles():
         
         for i, vehicle in enumerate(response.data, 1):
             vehicle_id = vehicle.get('id', 'N/A')
-            name = vehicle.get('display_name', 'Unknown')
+            name = vehicle.get('car_display_name') or 'Unknown'
             make = vehicle.get('make', 'N/A')
             model = vehicle.get('model', 'N/A')
             total_records = vehicle.get('total_records', 0)
@@ -121,11 +145,6 @@ def check_vehicles():
             print(f"   Make/Model: {make} {model}")
             print(f"   Total Records: {total_records}")
             print()
-        
-    except Exception as e:
-        print(f"❌ Error checking vehicles: {e}")
-        import traceback
-        traceback.print_exc()
 
 def main():
     print()
@@ -133,11 +152,17 @@ def main():
     print("=" * 60)
     print()
     
-    # Check data
-    has_data = check_recent_data()
-    
-    # Check vehicles
-    check_vehicles()
+    # Both queries are independent - send them together so the script
+    # waits on one round-trip instead of two
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        recent_future = pool.submit(fetch_recent_data)
+        vehicles_future = pool.submit(fetch_vehicles)
+        
+        # Check data
+        has_data = check_recent_data(recent_future)
+        
+        # Check vehicles
+        check_vehicles(vehicles_future)
     
     print()
     print("=" * 60)
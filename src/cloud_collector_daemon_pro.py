@@ -6,11 +6,13 @@ Stores OBD-II data directly to Supabase with professional logging
 
 import obd
 import time
+import random
 import signal
 import sys
 import os
 from datetime import datetime, timezone
-from threading import Thread, Event
+from threading import Thread, Event, Lock
+import queue
 import logging
 from collections import deque
 import hashlib
@@ -36,7 +38,8 @@ except ImportError as e:
     print(f"❌ Cloud storage unavailable: {e}")
     sys.exit(1)
 
-# Professional logging
+# Professional logging (FileHandler opens immediately, so the directory must exist)
+os.makedirs('logs', exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -47,6 +50,62 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ALL OBD COMMANDS (27 raw + 3 special)
+OBD_COMMANDS = {
+    # Core Engine (8)
+    'rpm': obd.commands.RPM,
+    'speed': obd.commands.SPEED,
+    'coolant_temp': obd.commands.COOLANT_TEMP,
+    'engine_load': obd.commands.ENGINE_LOAD,
+    'intake_temp': obd.commands.INTAKE_TEMP,
+    'timing_advance': obd.commands.TIMING_ADVANCE,
+    'run_time': obd.commands.RUN_TIME,
+    'absolute_load': obd.commands.ABSOLUTE_LOAD,
+    
+    # Fuel System (7)
+    'fuel_level': obd.commands.FUEL_LEVEL,
+    'fuel_pressure': obd.commands.FUEL_PRESSURE,
+    'throttle_pos': obd.commands.THROTTLE_POS,
+    'short_fuel_trim_1': obd.commands.SHORT_FUEL_TRIM_1,
+    'long_fuel_trim_1': obd.commands.LONG_FUEL_TRIM_1,
+    'short_fuel_trim_2': obd.commands.SHORT_FUEL_TRIM_2,
+    'long_fuel_trim_2': obd.commands.LONG_FUEL_TRIM_2,
+    
+    # Air Intake (3)
+    'maf': obd.commands.MAF,
+    'intake_pressure': obd.commands.INTAKE_PRESSURE,
+    'barometric_pressure': obd.commands.BAROMETRIC_PRESSURE,
+    
+    # Emissions (3)
+    'o2_b1s1': obd.commands.O2_B1S1,
+    'o2_b1s2': obd.commands.O2_B1S2,
+    'catalyst_temp_b1s1': obd.commands.CATALYST_TEMP_B1S1,
+    
+    # Environmental (1)
+    'ambient_air_temp': obd.commands.AMBIANT_AIR_TEMP,
+    
+    # Electrical (1)
+    'control_module_voltage': obd.commands.CONTROL_MODULE_VOLTAGE,
+    
+    # Diagnostic (2)
+    'distance_w_mil': obd.commands.DISTANCE_W_MIL,
+}
+
+# Diagnostic queries read alongside the sensors
+DIAGNOSTIC_COMMANDS = (obd.commands.GET_DTC, obd.commands.STATUS, obd.commands.FUEL_STATUS)
+
+# Legacy status text indexed by health_status, and live-display icons
+HEALTH_STATUS_LABELS = ('NORMAL', 'ADVISORY', 'WARNING', 'CRITICAL')
+STATUS_ICONS = {'NORMAL': '🟢', 'WARNING': '🟠', 'CRITICAL': '🔴'}
+
+# Simple VIN decoding table (3-character WMI -> make)
+WMI_MAKES = {
+    '1G1': 'Chevrolet', '1FA': 'Ford', '1HG': 'Honda',
+    '2T1': 'Toyota', '3VW': 'Volkswagen', '4F2': 'Mazda',
+    '5YJ': 'Tesla', 'JHM': 'Honda', 'KMH': 'Hyundai',
+    'WBA': 'BMW', 'WDD': 'Mercedes-Benz'
+}
+
 
 class ProfessionalCloudCollector:
     """Professional cloud-first vehicle data collector"""
@@ -57,7 +116,22 @@ class ProfessionalCloudCollector:
         self.vehicle_name = None
         self.connection = None
         self.supported_commands = set()
+        self.active_commands = ()
+        self.unsupported_fields = {}
+        self.vin = None
         self.data_buffer = deque(maxlen=100)
+        
+        # Full batches are handed to a writer thread so uploads never stall OBD reads
+        self.upload_queue = queue.Queue(maxsize=4)
+        self.upload_thread = None
+        self.upload_backlogged = False
+        self.collection_thread = None
+        self.stats_lock = Lock()
+        
+        # Shutdown budget, kept inside systemd's default 90s stop timeout
+        self.stop_timeout = 75          # stop_collection waits this long for the collection thread
+        self.upload_join_timeout = 45   # finish_uploads waits this long for the upload thread
+        self.upload_put_timeout = 5     # per hand-off to a full upload queue during shutdown
         self.batch_size = 3
         self.collection_interval = 1.0
         self.ml_predictor = None
@@ -66,7 +140,19 @@ class ProfessionalCloudCollector:
         self.ml_prediction_interval = 3  # Run ML every 3rd batch
         self.last_ml_fields = None  # Cache last ML prediction to fill gaps between predictions
         
+        # Live display: per-reading lines on a terminal, buffered plain text when redirected.
+        # COLLECTOR_LIVE_UI=0 turns it off for headless runs
+        self.live_ui_enabled = os.getenv('COLLECTOR_LIVE_UI', '1') != '0'
+        self.live_output_is_tty = sys.stdout.isatty()
+        self.live_lines = []
+        self.live_flush_every = 20
+        
         self.running = Event()
+        self.stop_event = Event()  # Set on shutdown; wakes any retry/reconnect wait early
+        
+        # obd.Async polls the watched PIDs in passes; a reading is taken once per completed pass
+        self.poll_pass_done = Event()
+        self.poll_wait_timeout = 15
         
         # Statistics
         self.session_stats = {
@@ -109,7 +195,7 @@ class ProfessionalCloudCollector:
     def _generate_session_id(self):
         """Generate unique session identifier"""
         timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
-        hash_part = hashlib.md5(f"{timestamp}_{time.time()}".encode()).hexdigest()[:8]
+        hash_part = hashlib.blake2b(f"{timestamp}_{time.time()}".encode(), digest_size=4).hexdigest()
         return f"cloud_{timestamp}_{hash_part}"
     
     def _signal_handler(self, signum, frame):
@@ -118,76 +204,125 @@ class ProfessionalCloudCollector:
         self.stop_collection()
         sys.exit(0)
     
-    def connect_obd(self, max_attempts=3):
+    def connect_obd(self, max_attempts=3, retry_delay=5, max_retry_delay=60):
         """Connect to OBD-II adapter with retries"""
         logger.info("🔌 Connecting to OBD-II adapter...")
         
         # Try USB ports first (more stable), then fall back to Bluetooth
         ports = ['/dev/ttyACM0', '/dev/ttyUSB0', '/dev/ttyUSB1', '/dev/rfcomm0']  # USB first, Bluetooth fallback
+        available_ports = [port for port in ports if os.path.exists(port)]
         
         for attempt in range(1, max_attempts + 1):
-            for port in ports:
-                if not os.path.exists(port):
-                    continue
-                
+            # Rescan only when nothing was plugged in yet
+            if not available_ports:
+                available_ports = [port for port in ports if os.path.exists(port)]
+            
+            for port in available_ports:
+                if self.stop_event.is_set():
+                    return False
                 logger.info(f"   Attempt {attempt}/{max_attempts} on {port}...")
                 
                 try:
-                    self.connection = obd.OBD(port, fast=False, timeout=10)
+                    self.connection = obd.Async(port, fast=False, timeout=10)
                     
                     if self.connection.is_connected():
                         scanner_type = "Bluetooth OBD" if "rfcomm" in port else "USB OBD"
                         logger.info(f"✅ Connected to OBD-II on {port} ({scanner_type})")
                         self.supported_commands = set(self.connection.supported_commands)
+                        self.active_commands = tuple(
+                            (key, command) for key, command in OBD_COMMANDS.items()
+                            if command in self.supported_commands
+                        )
+                        self.unsupported_fields = dict.fromkeys(
+                            (key for key, command in OBD_COMMANDS.items()
+                             if command not in self.supported_commands), 0
+                        )
+                        self.vin = None
                         logger.info(f"   Supported commands: {len(self.supported_commands)}")
                         return True
                     
                 except Exception as e:
-                    logger.debug(f"   Failed: {e}")
+                    logger.debug("   Failed: %s", e)
             
             if attempt < max_attempts:
-                logger.info(f"   Retrying in 5 seconds...")
-                time.sleep(5)
+                # Exponential backoff with jitter so daemons don't retry in lockstep
+                delay = min(retry_delay * 2 ** (attempt - 1), max_retry_delay) + random.uniform(0, 1.0)
+                logger.info(f"   Retrying in {delay:.1f} seconds...")
+                if self.stop_event.wait(delay):
+                    return False
         
         logger.error("❌ Could not connect to OBD-II adapter")
         return False
     
+    def read_vin(self):
+        """Query the VIN once per connection and reuse it afterwards"""
+        if self.vin is None:
+            self.vin = ''
+            try:
+                if obd.commands.VIN in self.supported_commands:
+                    # obd.Async overrides query() to return the cached response of a
+                    # watched command (an empty one otherwise), even before start().
+                    # The VIN is read once and never watched, so send it through the
+                    # base class's blocking query(), the same request a plain obd.OBD makes
+                    response = obd.OBD.query(self.connection, obd.commands.VIN)
+                    if not response.is_null():
+                        self.vin = str(response.value).strip()
+            except:
+                pass
+        return self.vin
+    
+    def start_streaming(self):
+        """Watch the supported sensors and let obd.Async poll them in the background"""
+        self.poll_pass_done.clear()
+        for _, command in self.active_commands:
+            self.connection.watch(command)
+        if self.active_commands:
+            # Async polls in watch order, so the last sensor's update marks a finished pass
+            self.connection.watch(self.active_commands[-1][1], callback=self._on_poll_pass)
+        for command in DIAGNOSTIC_COMMANDS:
+            self.connection.watch(command)
+        self.connection.start()
+        logger.info("📡 OBD streaming started")
+    
+    def _on_poll_pass(self, response):
+        """obd.Async callback: every watched sensor has been refreshed"""
+        self.poll_pass_done.set()
+    
     def generate_vehicle_signature(self):
         """Generate unique vehicle identifier from OBD"""
         try:
-            signature_components = []
+            # Hash kept on SHA-256 so known vehicles keep their car_identifier;
+            # fed incrementally, same digest as hashing "<commands>|<vin>"
+            signature = hashlib.sha256()
+            has_components = False
             
             # Use supported commands as fingerprint
             if self.supported_commands:
-                cmd_str = ''.join(sorted([str(cmd) for cmd in self.supported_commands]))
-                signature_components.append(cmd_str)
+                for cmd_name in sorted(str(cmd) for cmd in self.supported_commands):
+                    signature.update(cmd_name.encode())
+                has_components = True
             
             # Try to get VIN
-            try:
-                if obd.commands.VIN in self.supported_commands:
-                    response = self.connection.query(obd.commands.VIN)
-                    if not response.is_null():
-                        vin = str(response.value).strip()
-                        if vin and len(vin) == 17:
-                            signature_components.append(vin)
-                            logger.info(f"🔍 Found VIN: {vin}")
-            except:
-                pass
+            vin = self.read_vin()
+            if vin and len(vin) == 17:
+                if has_components:
+                    signature.update(b"|")
+                signature.update(vin.encode())
+                has_components = True
+                logger.info(f"🔍 Found VIN: {vin}")
             
-            # Create hash
-            if signature_components:
-                signature_string = "|".join(signature_components)
-                signature_hash = hashlib.sha256(signature_string.encode()).hexdigest()[:32]
+            if has_components:
+                signature_hash = signature.hexdigest()[:32]
             else:
                 # Fallback
-                signature_hash = hashlib.md5(f"fallback_{time.time()}".encode()).hexdigest()[:16]
+                signature_hash = hashlib.blake2b(f"fallback_{time.time()}".encode(), digest_size=8).hexdigest()
             
             logger.info(f"🔑 Vehicle signature: {signature_hash}")
             return signature_hash
             
         except Exception as e:
             logger.error(f"Error generating signature: {e}")
-            return hashlib.md5(f"error_{time.time()}".encode()).hexdigest()[:16]
+            return hashlib.blake2b(f"error_{time.time()}".encode(), digest_size=8).hexdigest()
     
     def detect_and_setup_vehicle(self):
         """Detect vehicle and setup cloud profile with real name"""
@@ -199,24 +334,11 @@ class ProfessionalCloudCollector:
             model = "Unknown"
             year = datetime.now().year
             
-            # Try to get VIN and decode
-            try:
-                if obd.commands.VIN in self.supported_commands:
-                    response = self.connection.query(obd.commands.VIN)
-                    if not response.is_null():
-                        vin = str(response.value).strip()
-                        # Simple VIN decoding (3-character WMI)
-                        wmi = vin[:3]
-                        wmi_map = {
-                            '1G1': 'Chevrolet', '1FA': 'Ford', '1HG': 'Honda',
-                            '2T1': 'Toyota', '3VW': 'Volkswagen', '4F2': 'Mazda',
-                            '5YJ': 'Tesla', 'JHM': 'Honda', 'KMH': 'Hyundai',
-                            'WBA': 'BMW', 'WDD': 'Mercedes-Benz'
-                        }
-                        make = wmi_map.get(wmi, "Unknown")
-                        logger.info(f"🚗 Detected make: {make}")
-            except:
-                pass
+            # Decode the VIN read during signature generation
+            vin = self.read_vin()
+            if vin:
+                make = WMI_MAKES.get(vin[:3], "Unknown")
+                logger.info(f"🚗 Detected make: {make}")
             
             # Create display name
             if make != "Unknown":
@@ -257,65 +379,26 @@ class ProfessionalCloudCollector:
             'session_id': self.session_id
         }
         
-        # ALL OBD COMMANDS (27 raw + 3 special)
-        obd_commands = {
-            # Core Engine (8)
-            'rpm': obd.commands.RPM,
-            'speed': obd.commands.SPEED,
-            'coolant_temp': obd.commands.COOLANT_TEMP,
-            'engine_load': obd.commands.ENGINE_LOAD,
-            'intake_temp': obd.commands.INTAKE_TEMP,
-            'timing_advance': obd.commands.TIMING_ADVANCE,
-            'run_time': obd.commands.RUN_TIME,
-            'absolute_load': obd.commands.ABSOLUTE_LOAD,
-            
-            # Fuel System (7)
-            'fuel_level': obd.commands.FUEL_LEVEL,
-            'fuel_pressure': obd.commands.FUEL_PRESSURE,
-            'throttle_pos': obd.commands.THROTTLE_POS,
-            'short_fuel_trim_1': obd.commands.SHORT_FUEL_TRIM_1,
-            'long_fuel_trim_1': obd.commands.LONG_FUEL_TRIM_1,
-            'short_fuel_trim_2': obd.commands.SHORT_FUEL_TRIM_2,
-            'long_fuel_trim_2': obd.commands.LONG_FUEL_TRIM_2,
-            
-            # Air Intake (3)
-            'maf': obd.commands.MAF,
-            'intake_pressure': obd.commands.INTAKE_PRESSURE,
-            'barometric_pressure': obd.commands.BAROMETRIC_PRESSURE,
-            
-            # Emissions (3)
-            'o2_b1s1': obd.commands.O2_B1S1,
-            'o2_b1s2': obd.commands.O2_B1S2,
-            'catalyst_temp_b1s1': obd.commands.CATALYST_TEMP_B1S1,
-            
-            # Environmental (1)
-            'ambient_air_temp': obd.commands.AMBIANT_AIR_TEMP,
-            
-            # Electrical (1)
-            'control_module_voltage': obd.commands.CONTROL_MODULE_VOLTAGE,
-            
-            # Diagnostic (2)
-            'distance_w_mil': obd.commands.DISTANCE_W_MIL,
-        }
-        
         successful_reads = 0
         
-        for key, command in obd_commands.items():
-            if command in self.supported_commands:
-                try:
-                    response = self.connection.query(command)
-                    if not response.is_null():
-                        value = response.value.magnitude if hasattr(response.value, 'magnitude') else float(response.value)
-                        data[key] = value
-                        if key in ["timing_advance", "run_time", "control_module_voltage", "o2_b1s2"]:
-                            logger.info(f"DEBUG: Read {key} = {value}")
-                        successful_reads += 1
-                except Exception as e:
-                    logger.debug(f"Failed {key}: {e}")
-                    data[key] = 0
-            else:
+        # Unsupported sensors read as 0
+        data.update(self.unsupported_fields)
+        
+        for key, command in self.active_commands:
+            try:
+                response = self.connection.query(command)
+                if not response.is_null():
+                    value = response.value.magnitude if hasattr(response.value, 'magnitude') else float(response.value)
+                    data[key] = value
+                    successful_reads += 1
+            except Exception as e:
+                logger.debug("Failed %s: %s", key, e)
                 data[key] = 0
         
+        # Nothing came back: skip diagnostics, labeling and features for a reading we'd discard
+        if successful_reads == 0:
+            return None
+        
         # DTC Count
         try:
             dtc_resp = self.connection.query(obd.commands.GET_DTC)
@@ -352,8 +435,7 @@ class ProfessionalCloudCollector:
         
         # 2. Temperature Gradient - detects overheating trends (°C/minute)
         current_temp = data.get('coolant_temp')
-        import time as time_module
-        current_time = time_module.time()
+        current_time = time.monotonic()
         if current_temp is not None and self.prev_temp is not None and self.prev_temp_time is not None:
             time_delta_minutes = (current_time - self.prev_temp_time) / 60.0
             if time_delta_minutes > 0:
@@ -377,13 +459,13 @@ class ProfessionalCloudCollector:
             data['fuel_efficiency'] = None
         
         # Quality score
-        total = len(obd_commands) + 3
+        total = len(OBD_COMMANDS) + len(DIAGNOSTIC_COMMANDS)
         data['data_quality'] = int((successful_reads / total) * 100)
         
         # Legacy status
-        data['status'] = ['NORMAL', 'ADVISORY', 'WARNING', 'CRITICAL'][data['health_status']]
+        data['status'] = HEALTH_STATUS_LABELS[data['health_status']]
         
-        return data if successful_reads > 0 else None
+        return data
     
     def _auto_label_health(self, data):
         """Enhanced auto-label with engine stress analysis
@@ -396,14 +478,19 @@ class ProfessionalCloudCollector:
         
         NOTE: fuel_level removed (unsupported by Toyota Veloz OBD)
         """
+        # Each value is looked up once; both the CRITICAL gate and the score use them
+        coolant_temp = data.get('coolant_temp', 0)
+        voltage = data.get('control_module_voltage', 14)
+        dtc_count = data.get('dtc_count', 0)
+        engine_load = data.get('engine_load', 0)
         
         # === CRITICAL (3) - Immediate action required ===
         # Severe conditions that can cause engine damage
-        if (data.get('coolant_temp', 0) > 110 or              # Severe overheating
-            data.get('control_module_voltage', 14) < 11 or     # Battery dying
-            data.get('dtc_count', 0) > 10 or                   # Many error codes
+        if (coolant_temp > 110 or                              # Severe overheating
+            voltage < 11 or                                    # Battery dying
+            dtc_count > 10 or                                  # Many error codes
             data.get('catalyst_temp_b1s1', 0) > 900 or         # Cat converter failing
-            data.get('engine_load', 0) > 95):                  # Extreme engine stress
+            engine_load > 95):                                 # Extreme engine stress
             return 3, 15  # CRITICAL status, max stress score, 15  # CRITICAL status, max stress score
         
         # === Engine Stress Score Calculation ===
@@ -411,7 +498,6 @@ class ProfessionalCloudCollector:
         stress_score = 0
         
         # 1. Engine Load Analysis (most important for wear prediction)
-        engine_load = data.get('engine_load', 0)
         if engine_load > 85:
             stress_score += 3  # Very high load (highway, uphill, towing)
         elif engine_load > 70:
@@ -428,7 +514,6 @@ class ProfessionalCloudCollector:
             stress_score += 2  # Very high RPM = engine stress
         
         # 3. Temperature Stress
-        coolant_temp = data.get('coolant_temp', 0)
         if coolant_temp > 105:
             stress_score += 3  # Near critical temp
         elif coolant_temp > 100:
@@ -437,7 +522,6 @@ class ProfessionalCloudCollector:
             stress_score += 1  # Warm but manageable
         
         # 4. Voltage Issues (electrical stress)
-        voltage = data.get('control_module_voltage', 14)
         if voltage < 12:
             stress_score += 2  # Low voltage = alternator/battery issue
         elif voltage < 13:
@@ -460,7 +544,6 @@ class ProfessionalCloudCollector:
             stress_score += 1  # O2 sensor or mixture issue
         
         # 7. Diagnostic Codes
-        dtc_count = data.get('dtc_count', 0)
         if dtc_count >= 3:
             stress_score += 2
         elif dtc_count >= 1:
@@ -491,45 +574,50 @@ class ProfessionalCloudCollector:
         """Main data collection loop with professional logging"""
         logger.info("🚀 Starting cloud data collection...")
         
-        print(f"\n📊 LIVE CLOUD DATA COLLECTION ACTIVE")
-        print("="*70)
-        print(f"{'#':<6} {'RPM':<8} {'Temp':<7} {'Load':<6} {'Speed':<7} {'Status':<10} {'Quality':<7}")
-        print("-"*70)
+        if self.live_ui_enabled:
+            print(f"\n📊 LIVE CLOUD DATA COLLECTION ACTIVE")
+            print("="*70)
+            print(f"{'#':<6} {'RPM':<8} {'Temp':<7} {'Load':<6} {'Speed':<7} {'Status':<10} {'Quality':<7}")
+            print("-"*70)
         
         consecutive_errors = 0
         max_errors = 5
         
+        # Readings are scheduled against a monotonic deadline so the interval doesn't drift
+        next_deadline = time.monotonic()
+        
         while self.running.is_set():
             try:
+                # A full poll pass over ~28 PIDs takes several seconds; wait for a fresh
+                # one so each reading holds new values instead of re-uploading the cache
+                fresh = self.poll_pass_done.wait(timeout=self.poll_wait_timeout)
+                if not self.running.is_set():
+                    break
+                self.poll_pass_done.clear()
+                
                 self.session_stats['total_readings'] += 1
                 reading_num = self.session_stats['total_readings']
                 
-                sensor_data = self.read_obd_data()
+                # No pass within the timeout means the adapter stalled: count it as a failed read
+                sensor_data = self.read_obd_data() if fresh else None
                 
                 if sensor_data:
                     self.session_stats['successful_readings'] += 1
                     self.data_buffer.append(sensor_data)
                     
                     # Display live data (like automated_car_collector_daemon)
-                    rpm = sensor_data.get('rpm', 0)
-                    temp = sensor_data.get('coolant_temp', 0)
-                    load = sensor_data.get('engine_load', 0)
-                    speed = sensor_data.get('speed', 0)
-                    status = sensor_data.get('status', 'NORMAL')
-                    quality = sensor_data.get('data_quality', 0) / 100.0
-                    
-                    status_icon = {'NORMAL': '🟢', 'WARNING': '🟠', 'CRITICAL': '🔴'}.get(status, '⚪')
-                    
-                    print(f"{reading_num:>5}: {rpm:>7.0f} {temp:>6.1f}°C {load:>5.1f}% {speed:>6.1f} {status_icon}{status:<9} {quality:>6.2f}")
+                    if self.live_ui_enabled:
+                        self.display_live_reading(reading_num, sensor_data)
                     
                     # Upload batch when full
                     if len(self.data_buffer) >= self.batch_size:
-                        self.upload_batch_to_cloud()
+                        self.queue_batch_for_upload()
                     
                     consecutive_errors = 0
                 else:
                     consecutive_errors += 1
-                    self.session_stats['errors'] += 1
+                    with self.stats_lock:
+                        self.session_stats['errors'] += 1
                     
                     if consecutive_errors >= max_errors:
                         logger.warning(f"WARNING: Too many consecutive errors ({consecutive_errors}), attempting reconnect...")
@@ -540,41 +628,139 @@ class ProfessionalCloudCollector:
                             except:
                                 pass
                         
-                        time.sleep(10)  # Wait before reconnecting
+                        if self.stop_event.wait(10):  # Wait before reconnecting
+                            break
                         if self.connect_obd():
+                            self.start_streaming()
                             logger.info("RECONNECTED: Connection restored!")
                             consecutive_errors = 0  # Reset counter
                         else:
                             logger.error("RECONNECT FAILED: Will retry in 30 seconds...")
-                            time.sleep(30)
+                            if self.stop_event.wait(30):
+                                break
                 
-                time.sleep(self.collection_interval)
+                next_deadline += self.collection_interval
+                sleep_time = next_deadline - time.monotonic()
+                if sleep_time > 0:
+                    self.stop_event.wait(sleep_time)
+                else:
+                    # Overran (slow upload or reconnect): restart the schedule instead of bursting
+                    logger.debug("Collection overrun %.3fs", -sleep_time)
+                    next_deadline = time.monotonic()
                 
             except KeyboardInterrupt:
                 logger.info("🛑 Keyboard interrupt received")
                 break
             except Exception as e:
                 logger.error(f"Collection loop error: {e}")
-                self.session_stats['errors'] += 1
+                with self.stats_lock:
+                    self.session_stats['errors'] += 1
                 consecutive_errors += 1
-                time.sleep(5)
+                self.stop_event.wait(5)
         
         # Clear running flag so main() knows we stopped
         self.running.clear()
+        self.flush_live_lines()
 
         # Final batch
+        self.finish_uploads()
+    
+    def display_live_reading(self, reading_num, sensor_data):
+        """Print one live reading line"""
+        rpm = sensor_data.get('rpm', 0)
+        temp = sensor_data.get('coolant_temp', 0)
+        load = sensor_data.get('engine_load', 0)
+        speed = sensor_data.get('speed', 0)
+        status = sensor_data.get('status', 'NORMAL')
+        quality = sensor_data.get('data_quality', 0) / 100.0
+        
+        if self.live_output_is_tty:
+            status_icon = STATUS_ICONS.get(status, '⚪')
+            print(f"{reading_num:>5}: {rpm:>7.0f} {temp:>6.1f}°C {load:>5.1f}% {speed:>6.1f} {status_icon}{status:<9} {quality:>6.2f}")
+            return
+        
+        # Redirected (journal/log file): plain ASCII, written in chunks
+        self.live_lines.append(f"{reading_num:>5}: {rpm:>7.0f} {temp:>6.1f}C {load:>5.1f}% {speed:>6.1f} {status:<9} {quality:>6.2f}")
+        if len(self.live_lines) >= self.live_flush_every:
+            self.flush_live_lines()
+    
+    def flush_live_lines(self):
+        """Write any buffered live lines to stdout"""
+        if self.live_lines:
+            sys.stdout.write("\n".join(self.live_lines) + "\n")
+            sys.stdout.flush()
+            self.live_lines.clear()
+    
+    def queue_batch_for_upload(self):
+        """Hand the buffered readings to the upload thread"""
+        batch_data = list(self.data_buffer)
+        try:
+            self.upload_queue.put_nowait(batch_data)
+        except queue.Full:
+            # Uploads are falling behind; keep buffering and try again next reading.
+            # Logged once per backlog rather than on every reading
+            if not self.upload_backlogged:
+                self.upload_backlogged = True
+                logger.warning("⚠️ Upload queue full, buffering readings until uploads catch up")
+            return
+        self.data_buffer.clear()
+        if self.upload_backlogged:
+            self.upload_backlogged = False
+            logger.info("💾 Upload queue accepting batches again")
+    
+    def upload_worker(self):
+        """Upload queued batches until the shutdown sentinel arrives"""
+        pending = []
+        while True:
+            batch_data = self.upload_queue.get()
+            if batch_data is None:
+                if pending:
+                    logger.warning("⚠️ Dropping %d readings that failed to upload", len(pending))
+                break
+            # A failed batch is retried together with the next one
+            pending.extend(batch_data)
+            if self.upload_batch_to_cloud(pending):
+                pending = []
+            else:
+                pending = pending[-self.data_buffer.maxlen:]
+    
+    def finish_uploads(self):
+        """Queue whatever is still buffered, then stop the upload thread and wait for it
+        
+        Called only by the collection thread once its loop exits, so nothing
+        can be queued behind the shutdown sentinel.
+        """
+        if self.upload_thread is None:
+            return
+        
         if self.data_buffer:
-            logger.info("💾 Storing final data batch...")
-            self.upload_batch_to_cloud()
+            logger.info("💾 Storing remaining data...")
+            try:
+                self.upload_queue.put(list(self.data_buffer), timeout=self.upload_put_timeout)
+            except queue.Full:
+                logger.warning("⚠️ Upload queue still full, dropping %d buffered readings", len(self.data_buffer))
+            self.data_buffer.clear()
+        
+        try:
+            self.upload_queue.put(None, timeout=self.upload_put_timeout)
+        except queue.Full:
+            logger.warning("⚠️ Upload thread stuck, leaving %d queued batches to finish in the background",
+                           self.upload_queue.qsize())
+            return
+        
+        self.upload_thread.join(timeout=self.upload_join_timeout)
+        if self.upload_thread.is_alive():
+            logger.warning("⚠️ Upload thread still busy after %ds, leaving it to finish in the background",
+                           self.upload_join_timeout)
+        else:
+            self.upload_thread = None
     
-    def upload_batch_to_cloud(self):
+    def upload_batch_to_cloud(self, batch_data):
         """Upload batch to Supabase (sensor_data, sensor_data_realtime, telemetry_data)"""
-        if not self.data_buffer or not self.current_vehicle_id:
-            return
+        if not batch_data or not self.current_vehicle_id:
+            return False
         
         try:
-            batch_data = list(self.data_buffer)
-            
             # Increment batch counter for ML timing
             self.batch_counter += 1
             should_run_ml = (self.batch_counter % self.ml_prediction_interval == 0)
@@ -602,9 +788,9 @@ class ProfessionalCloudCollector:
                         )
                         
                         if ml_success:
-                            logger.info(f"🤖 ML Prediction: {prediction['predicted_status']} "
-                                      f"(score: {ml_fields['ml_health_score']}/100, "
-                                      f"confidence: {prediction['confidence_score']}%)")
+                            logger.info("🤖 ML Prediction: %s (score: %s/100, confidence: %s%%)",
+                                        prediction['predicted_status'], ml_fields['ml_health_score'],
+                                        prediction['confidence_score'])
                 except Exception as e:
                     logger.error(f"❌ ML prediction error: {e}")
             
@@ -613,7 +799,7 @@ class ProfessionalCloudCollector:
             if self.last_ml_fields:
                 for reading in batch_data:
                     reading.update(self.last_ml_fields)
-                logger.debug(f"   Applied ML fields to batch (status: {self.last_ml_fields.get('ml_status')})")
+                logger.debug("   Applied ML fields to batch (status: %s)", self.last_ml_fields.get('ml_status'))
             else:
                 # No ML prediction yet (first few batches), use default values
                 default_ml = {
@@ -631,15 +817,18 @@ class ProfessionalCloudCollector:
             )
             
             if success:
-                self.session_stats['stored_records'] += len(batch_data)
-                logger.info(f"💾 Batch stored: {len(batch_data)}/{len(batch_data)} records (Total: {self.session_stats['stored_records']})")
-                self.data_buffer.clear()
+                with self.stats_lock:
+                    self.session_stats['stored_records'] += len(batch_data)
+                logger.info("💾 Batch stored: %d/%d records (Total: %d)", len(batch_data), len(batch_data), self.session_stats['stored_records'])
             else:
                 logger.warning("⚠️ Failed to upload batch to cloud")
+            return success
                 
         except Exception as e:
             logger.error(f"❌ Batch upload error: {e}")
-            self.session_stats['errors'] += 1
+            with self.stats_lock:
+                self.session_stats['errors'] += 1
+            return False
     
     def start_collection(self):
         """Start cloud data collection"""
@@ -655,6 +844,9 @@ class ProfessionalCloudCollector:
             logger.error("❌ Cannot start without vehicle profile")
             return False
         
+        # Start background polling once the VIN has been read
+        self.start_streaming()
+        
         # Display session info
         print(f"\n🚀 CLOUD COLLECTION SESSION INITIALIZED")
         print("="*55)
@@ -669,9 +861,13 @@ class ProfessionalCloudCollector:
         self.session_stats['start_time'] = time.time()
         self.running.set()
         
+        # Start upload thread
+        self.upload_thread = Thread(target=self.upload_worker, daemon=True)
+        self.upload_thread.start()
+        
         # Start collection thread
-        collection_thread = Thread(target=self.data_collection_loop)
-        collection_thread.start()
+        self.collection_thread = Thread(target=self.data_collection_loop)
+        self.collection_thread.start()
         
         logger.info("✅ Cloud collection started successfully")
         return True
@@ -683,11 +879,16 @@ class ProfessionalCloudCollector:
         
         logger.info("🛑 Stopping cloud collection...")
         self.running.clear()
-        
-        # Store remaining data
-        if self.data_buffer:
-            logger.info("💾 Storing remaining data...")
-            self.upload_batch_to_cloud()
+        self.stop_event.set()
+        self.poll_pass_done.set()
+        
+        # The collection thread flushes the remaining data on its way out
+        if self.collection_thread and self.collection_thread.is_alive():
+            logger.info("💾 Waiting for remaining data to upload...")
+            self.collection_thread.join(timeout=self.stop_timeout)
+            if self.collection_thread.is_alive():
+                logger.warning("⚠️ Collection thread still running after %ds, shutting down anyway",
+                               self.stop_timeout)
         
         # Close OBD connection
         if self.connection:
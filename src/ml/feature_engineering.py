@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Shared feature engineering for the 4-class health model
+Used by training and prediction so both build identical feature columns
+"""
+
+import numpy as np
+
+def engineer_features(df):
+    """Engineer 9 additional ML features"""
+    df = df.copy()
+    df['rpm_load_ratio'] = np.where(df['engine_load'] > 0, df['rpm'] / df['engine_load'], 0)
+    df['temp_efficiency'] = np.where(df['coolant_temp'] > 0, df['engine_load'] / df['coolant_temp'], 0)
+    df['speed_throttle_ratio'] = np.where(df['throttle_pos'] > 0, df['vehicle_speed'] / df['throttle_pos'], 0)
+    df['high_rpm'] = (df['rpm'] > 3000).astype(int)
+    df['low_speed'] = (df['vehicle_speed'] < 20).astype(int)
+    df['high_throttle'] = (df['throttle_pos'] > 70).astype(int)
+    df['voltage_health'] = ((df['control_module_voltage'] >= 12.5) & (df['control_module_voltage'] <= 14.5)).astype(int)
+    df['stress_indicator'] = (df['high_rpm'] * 0.3) + (df['high_throttle'] * 0.3) + ((df['coolant_temp'] > 95).astype(int) * 0.4)
+    return df.replace([np.inf, -np.inf], 0)
@@ -5,30 +5,18 @@ NORMAL / ADVISORY / WARNING / CRITICAL
 """
 import sys, os, json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import pandas as pd, numpy as np, joblib
+import pandas as pd, joblib
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 from datetime import datetime
+from feature_engineering import engineer_features
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'data', 'ml')
 MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'models')
 os.makedirs(MODEL_DIR, exist_ok=True)
 
-def engineer_features(df):
-    """Engineer 9 additional ML features"""
-    df = df.copy()
-    df['rpm_load_ratio'] = np.where(df['engine_load'] > 0, df['rpm'] / df['engine_load'], 0)
-    df['temp_efficiency'] = np.where(df['coolant_temp'] > 0, df['engine_load'] / df['coolant_temp'], 0)
-    df['speed_throttle_ratio'] = np.where(df['throttle_pos'] > 0, df['vehicle_speed'] / df['throttle_pos'], 0)
-    df['high_rpm'] = (df['rpm'] > 3000).astype(int)
-    df['low_speed'] = (df['vehicle_speed'] < 20).astype(int)
-    df['high_throttle'] = (df['throttle_pos'] > 70).astype(int)
-    df['voltage_health'] = ((df['control_module_voltage'] >= 12.5) & (df['control_module_voltage'] <= 14.5)).astype(int)
-    df['stress_indicator'] = (df['high_rpm'] * 0.3) + (df['high_throttle'] * 0.3) + ((df['coolant_temp'] > 95).astype(int) * 0.4)
-    return df.replace([np.inf, -np.inf], 0)
-
 def train_model():
     print("\n" + "="*80)
     print("🤖 TRAINING RANDOM FOREST MODEL - 4-CLASS CLASSIFICATION")
@@ -67,13 +55,12 @@ def train_model():
     health_labels = {0: 'NORMAL', 1: 'ADVISORY', 2: 'WARNING', 3: 'CRITICAL'}
     class_counts = y.value_counts().sort_index()
     
-    for status in sorted(y.unique()):
-        count = sum(y == status)
+    for status, count in class_counts.items():
         label = health_labels.get(status, f'Unknown({status})')
         print(f"   {label:<12} {count:>6,} ({count/len(y)*100:>5.1f}%)")
     
     # Check if we have all 4 classes
-    unique_classes = sorted(y.unique())
+    unique_classes = list(class_counts.index)
     num_classes = len(unique_classes)
     print(f"\n📊 Classes present: {num_classes} classes → {[health_labels.get(c, c) for c in unique_classes]}")
     
@@ -212,7 +199,7 @@ def train_model():
             'min_samples_leaf': 5,
             'class_weight': 'balanced'
         },
-        'class_distribution': {health_labels[int(cls)]: int((y == cls).sum()) for cls in unique_classes}
+        'class_distribution': {health_labels[int(cls)]: int(count) for cls, count in class_counts.items()}
     }
     
     with open(metadata_file, 'w') as f:
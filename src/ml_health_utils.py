@@ -3,6 +3,20 @@
 ML Health Utilities - Helper functions for ML prediction conversions
 """
 
+HEALTH_SCORE_MAP = {
+    0: 95.0,  # NORMAL - Excellent health
+    1: 70.0,  # ADVISORY - Good but needs monitoring
+    2: 45.0,  # WARNING - Degraded, requires attention
+    3: 20.0   # CRITICAL - Immediate action needed
+}
+
+STATUS_TEXT_MAP = {
+    0: 'NORMAL',
+    1: 'ADVISORY',
+    2: 'WARNING',
+    3: 'CRITICAL'
+}
+
 def prediction_to_health_score(predicted_status_int):
     """
     Convert ML prediction (0-3) to health score (0-100)
@@ -13,13 +27,7 @@ def prediction_to_health_score(predicted_status_int):
     Returns:
         float: Health score between 0-100
     """
-    health_score_map = {
-        0: 95.0,  # NORMAL - Excellent health
-        1: 70.0,  # ADVISORY - Good but needs monitoring
-        2: 45.0,  # WARNING - Degraded, requires attention
-        3: 20.0   # CRITICAL - Immediate action needed
-    }
-    return health_score_map.get(predicted_status_int, 50.0)  # Default to 50 if unknown
+    return HEALTH_SCORE_MAP.get(predicted_status_int, 50.0)  # Default to 50 if unknown
 
 
 def prediction_to_status_text(predicted_status_int):
@@ -32,13 +40,7 @@ def prediction_to_status_text(predicted_status_int):
     Returns:
         str: Status text (NORMAL, ADVISORY, WARNING, CRITICAL)
     """
-    status_map = {
-        0: 'NORMAL',
-        1: 'ADVISORY',
-        2: 'WARNING',
-        3: 'CRITICAL'
-    }
-    return status_map.get(predicted_status_int, 'UNKNOWN')
+    return STATUS_TEXT_MAP.get(predicted_status_int, 'UNKNOWN')
 
 
 def extract_ml_fields_from_prediction(prediction_result):
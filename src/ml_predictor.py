@@ -5,6 +5,11 @@ from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+RAW_FEATURES = ('rpm', 'vehicle_speed', 'coolant_temp', 'engine_load', 'throttle_pos',
+                'intake_temp', 'control_module_voltage', 'intake_pressure', 'fuel_level',
+                'barometric_pressure', 'ambient_air_temp', 'engine_runtime', 'distance_w_mil',
+                'fuel_pressure', 'timing_advance', 'maf', 'engine_stress_score')
+
 class MLHealthPredictor:
     def __init__(self, model_dir=None):
         if model_dir is None:
@@ -13,6 +18,7 @@ class MLHealthPredictor:
         self.model = None
         self.scaler = None
         self.metadata = None
+        self.feature_names = ()
         self.is_loaded = False
         self.health_labels = {0: 'NORMAL', 1: 'ADVISORY', 2: 'WARNING', 3: 'CRITICAL'}
         self.load_model()
@@ -29,6 +35,7 @@ class MLHealthPredictor:
             self.scaler = joblib.load(scaler_file)
             with open(metadata_file, 'r') as mf:
                 self.metadata = json.load(mf)
+            self.feature_names = tuple(self.metadata['features'])
             self.is_loaded = True
             logger.info(f"✅ ML Model loaded ({self.metadata['accuracy']*100:.2f}% accuracy)")
             return True
@@ -39,11 +46,7 @@ class MLHealthPredictor:
     
     def engineer_features(self, sensor_data):
         features = {}
-        raw_features = ['rpm', 'vehicle_speed', 'coolant_temp', 'engine_load', 'throttle_pos',
-                       'intake_temp', 'control_module_voltage', 'intake_pressure', 'fuel_level',
-                       'barometric_pressure', 'ambient_air_temp', 'engine_runtime', 'distance_w_mil',
-                       'fuel_pressure', 'timing_advance', 'maf', 'engine_stress_score']
-        for f in raw_features:
+        for f in RAW_FEATURES:
             if f == 'vehicle_speed' and 'speed' in sensor_data:
                 features[f] = sensor_data.get('speed', 0)
             elif f == 'engine_runtime' and 'run_time' in sensor_data:
@@ -73,8 +76,8 @@ class MLHealthPredictor:
         start_time = time.time()
         try:
             features = self.engineer_features(sensor_data)
-            feature_names = self.metadata['features']
-            X = np.array([float(features.get(f, 0) or 0) for f in feature_names]).reshape(1, -1)
+            feature_names = self.feature_names
+            X = np.fromiter((features.get(f) or 0 for f in feature_names), dtype=np.float64, count=len(feature_names)).reshape(1, -1)
             X_scaled = self.scaler.transform(X)
             prediction = self.model.predict(X_scaled)[0]
             probabilities = self.model.predict_proba(X_scaled)[0]
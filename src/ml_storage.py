@@ -3,6 +3,7 @@
 import logging
 from typing import Dict, Optional
 from datetime import datetime, timezone, timedelta
+from postgrest.types import ReturnMethod
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,10 @@ class MLPredictionStorage:
     
     def store_prediction(self, vehicle_id: int, sensor_data_id: Optional[int], prediction_result: Dict) -> bool:
         try:
+            probabilities = prediction_result['probabilities']
+            # Pad to three slots once instead of re-reading and measuring the list per column
+            risk_factors = list(prediction_result.get('top_risk_factors') or [])[:3]
+            risk_factors += [None] * (3 - len(risk_factors))
             prediction_data = {
                 'vehicle_id': vehicle_id,
                 'sensor_data_id': sensor_data_id,
@@ -20,16 +25,16 @@ class MLPredictionStorage:
                 'predicted_health_status': prediction_result['predicted_health_status'],
                 'predicted_status': prediction_result['predicted_status'],
                 'confidence_score': prediction_result['confidence_score'],
-                'prob_normal': prediction_result['probabilities']['normal'],
-                'prob_advisory': prediction_result['probabilities']['advisory'],
-                'prob_warning': prediction_result['probabilities'].get('warning', 0.0),
-                'prob_critical': prediction_result['probabilities']['critical'],
+                'prob_normal': probabilities['normal'],
+                'prob_advisory': probabilities['advisory'],
+                'prob_warning': probabilities.get('warning', 0.0),
+                'prob_critical': probabilities['critical'],
                 'predicted_failure_risk': prediction_result.get('failure_risk'),
                 'days_until_maintenance': prediction_result.get('days_until_maintenance'),
                 'recommended_actions': prediction_result.get('recommended_actions', []),
-                'top_risk_factor_1': prediction_result['top_risk_factors'][0] if len(prediction_result.get('top_risk_factors', [])) > 0 else None,
-                'top_risk_factor_2': prediction_result['top_risk_factors'][1] if len(prediction_result.get('top_risk_factors', [])) > 1 else None,
-                'top_risk_factor_3': prediction_result['top_risk_factors'][2] if len(prediction_result.get('top_risk_factors', [])) > 2 else None,
+                'top_risk_factor_1': risk_factors[0],
+                'top_risk_factor_2': risk_factors[1],
+                'top_risk_factor_3': risk_factors[2],
                 'model_version': prediction_result.get('model_version', '4class_v1'),
                 'model_accuracy': prediction_result.get('model_accuracy'),
                 'prediction_latency_ms': prediction_result.get('prediction_latency_ms')
@@ -37,7 +42,7 @@ class MLPredictionStorage:
             response = self.supabase.table('ml_predictions').insert(prediction_data).execute()
             if response.data:
                 prediction_id = response.data[0]['id']
-                logger.info(f"✅ Stored ML prediction #{prediction_id}")
+                logger.info("✅ Stored ML prediction #%s", prediction_id)
                 self.update_realtime_prediction(vehicle_id, prediction_id, prediction_data)
                 return True
             return False
@@ -66,8 +71,8 @@ class MLPredictionStorage:
                 'timestamp': prediction_data['timestamp'],
                 'updated_at': datetime.now(timezone.utc).isoformat()
             }
-            response = self.supabase.table('ml_predictions_realtime').upsert(realtime_data, on_conflict='vehicle_id').execute()
-            return bool(response.data)
+            self.supabase.table('ml_predictions_realtime').upsert(realtime_data, on_conflict='vehicle_id', returning=ReturnMethod.minimal).execute()
+            return True
         except Exception as e:
             logger.error(f"Failed to update realtime prediction: {e}")
             return False
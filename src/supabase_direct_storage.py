@@ -15,6 +15,7 @@ import logging
 
 try:
     from supabase import create_client, Client
+    from postgrest.types import ReturnMethod
     SUPABASE_AVAILABLE = True
 except ImportError:
     print("⚠️ Install supabase: pip install supabase")
@@ -23,6 +24,63 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# (sensor_data column, reading key, default) for every stored OBD parameter
+SENSOR_FIELD_MAP = (
+    # Core Engine (8)
+    ('rpm', 'rpm', 0),
+    ('vehicle_speed', 'speed', 0),
+    ('coolant_temp', 'coolant_temp', 0),
+    ('engine_load', 'engine_load', 0),
+    ('intake_temp', 'intake_temp', 0),
+    ('timing_advance', 'timing_advance', 0),
+    ('run_time', 'run_time', 0),
+    ('absolute_load', 'absolute_load', 0),
+    
+    # Fuel System (7)
+    ('fuel_level', 'fuel_level', 0),
+    ('fuel_pressure', 'fuel_pressure', 0),
+    ('throttle_pos', 'throttle_pos', 0),
+    ('fuel_trim_short', 'short_fuel_trim_1', 0),
+    ('fuel_trim_long', 'long_fuel_trim_1', 0),
+    ('short_fuel_trim_2', 'short_fuel_trim_2', 0),
+    ('long_fuel_trim_2', 'long_fuel_trim_2', 0),
+    
+    # Air Intake (3)
+    ('maf', 'maf', 0),
+    ('map', 'intake_pressure', 0),
+    ('barometric_pressure', 'barometric_pressure', 0),
+    
+    # Emissions (3)
+    ('o2_sensor_1', 'o2_b1s1', 0),
+    ('o2_b1s2', 'o2_b1s2', 0),
+    ('catalyst_temp_b1s1', 'catalyst_temp_b1s1', 0),
+    
+    # Environmental (1)
+    # ('ambient_air_temp', 'ambient_air_temp', 0),  # Not in Supabase schema
+    
+    # Electrical (1)
+    ('control_module_voltage', 'control_module_voltage', 0),
+    
+    # Diagnostic (5)
+    ('distance_w_mil', 'distance_w_mil', 0),
+    ('dtc_count', 'dtc_count', 0),
+    ('mil_status', 'mil_status', False),
+    ('fuel_status', 'fuel_status', 'Unknown'),
+    
+    # ML Training (1)
+    ('health_status', 'health_status', 0),
+    
+    # ML Predictions (4)
+    ('ml_health_score', 'ml_health_score', None),
+    ('ml_status', 'ml_status', None),
+    ('ml_alerts', 'ml_alerts', None),
+    ('ml_confidence', 'ml_confidence', None),
+    
+    # Metadata
+    ('data_quality_score', 'data_quality', 90),
+    ('status', 'status', 'NORMAL'),
+)
+
 class SupabaseDirectStorage:
     """Direct storage service for Supabase cloud database"""
     
@@ -83,7 +141,9 @@ class SupabaseDirectStorage:
                 logger.info(f"Found existing vehicle: {vehicle_id}")
                 return vehicle_id
             else:
-                # Create new vehicle profile
+                # Create new vehicle profile (one timestamp for every field)
+                now = datetime.now(timezone.utc)
+                now_iso = now.isoformat()
                 new_vehicle = {
                     'car_identifier': car_identifier,
                     'car_display_name': vehicle_data.get('display_name', f'Vehicle {car_identifier[:8]}'),
@@ -91,13 +151,13 @@ class SupabaseDirectStorage:
                     'model': vehicle_data.get('model', 'Unknown'),
                     'year': vehicle_data.get('year'),
                     'fuel_type': vehicle_data.get('fuel_type', 'Gasoline'),
-                    'notes': f'Auto-created - {datetime.now().strftime("%Y-%m-%d %H:%M")}',
+                    'notes': f'Auto-created - {now.astimezone().strftime("%Y-%m-%d %H:%M")}',
                     'total_sessions': 1,
                     'total_records': 0,
                     'is_active': True,
-                    'created_at': datetime.now(timezone.utc).isoformat(),
-                    'last_used': datetime.now(timezone.utc).isoformat(),
-                    'updated_at': datetime.now(timezone.utc).isoformat()
+                    'created_at': now_iso,
+                    'last_used': now_iso,
+                    'updated_at': now_iso
                 }
                 
                 result = self.supabase_client.table('vehicle_profiles').insert(new_vehicle).execute()
@@ -119,90 +179,27 @@ class SupabaseDirectStorage:
         try:
             # Prepare batch data with ALL parameters
             batch_data = []
+            batch_timestamp = datetime.now(timezone.utc).isoformat()  # fallback for readings without one
             for reading in sensor_readings:
-                sensor_record = {
-                    'vehicle_id': vehicle_id,
-                    'session_id': reading.get('session_id', 'direct_upload'),
-                    'timestamp': reading.get('timestamp', datetime.now(timezone.utc).isoformat()),
-                    
-                    # Core Engine (8)
-                    'rpm': reading.get('rpm', 0),
-                    'vehicle_speed': reading.get('speed', 0),
-                    'coolant_temp': reading.get('coolant_temp', 0),
-                    'engine_load': reading.get('engine_load', 0),
-                    'intake_temp': reading.get('intake_temp', 0),
-                    'timing_advance': reading.get('timing_advance', 0),
-                    'run_time': int(reading.get('run_time', 0)),
-                    'absolute_load': reading.get('absolute_load', 0),
-                    
-                    # Fuel System (7)
-                    'fuel_level': reading.get('fuel_level', 0),
-                    'fuel_pressure': reading.get('fuel_pressure', 0),
-                    'throttle_pos': reading.get('throttle_pos', 0),
-                    'fuel_trim_short': reading.get('short_fuel_trim_1', 0),
-                    'fuel_trim_long': reading.get('long_fuel_trim_1', 0),
-                    'short_fuel_trim_2': reading.get('short_fuel_trim_2', 0),
-                    'long_fuel_trim_2': reading.get('long_fuel_trim_2', 0),
-                    
-                    # Air Intake (3)
-                    'maf': reading.get('maf', 0),
-                    'map': reading.get('intake_pressure', 0),
-                    'barometric_pressure': reading.get('barometric_pressure', 0),
-                    
-                    # Emissions (3)
-                    'o2_sensor_1': reading.get('o2_b1s1', 0),
-                    'o2_b1s2': reading.get('o2_b1s2', 0),
-                    'catalyst_temp_b1s1': reading.get('catalyst_temp_b1s1', 0),
-                    
-                    # Environmental (1)
-                    # 'ambient_air_temp': reading.get('ambient_air_temp', 0),  # Not in Supabase schema
-                    
-                    # Electrical (1)
-                    'control_module_voltage': reading.get('control_module_voltage', 0),
-                    
-                    # Diagnostic (5)
-                    'distance_w_mil': reading.get('distance_w_mil', 0),
-                    'dtc_count': reading.get('dtc_count', 0),
-                    'mil_status': reading.get('mil_status', False),
-                    'fuel_status': reading.get('fuel_status', 'Unknown'),
-                    
-                    # ML Training (1)
-                    'health_status': reading.get('health_status', 0),
-                    
-                    # ML Predictions (4)
-                    'ml_health_score': reading.get('ml_health_score'),
-                    'ml_status': reading.get('ml_status'),
-                    'ml_alerts': reading.get('ml_alerts'),
-                    'ml_confidence': reading.get('ml_confidence'),
-                    
-                    # Metadata
-                    'data_quality_score': reading.get('data_quality', 90),
-                    'status': reading.get('status', 'NORMAL')
-                }
+                get = reading.get
+                sensor_record = {column: get(key, default) for column, key, default in SENSOR_FIELD_MAP}
+                sensor_record['vehicle_id'] = vehicle_id
+                sensor_record['session_id'] = get('session_id', 'direct_upload')
+                sensor_record['timestamp'] = get('timestamp', batch_timestamp)
+                sensor_record['run_time'] = int(sensor_record['run_time'])
                 batch_data.append(sensor_record)
             
-            # DEBUG: Log first record before insert
-            if batch_data and len(batch_data) > 0:
-                first_rec = batch_data[0]
-                logger.info(f"DEBUG STORAGE: timing_advance={first_rec.get('timing_advance')}, run_time={first_rec.get('run_time')}, control_module_voltage={first_rec.get('control_module_voltage')}")
+            # Insert batch data (rows are not echoed back; failures raise APIError)
+            self.supabase_client.table('sensor_data').insert(batch_data, returning=ReturnMethod.minimal).execute()
             
-            # DEBUG: Log first record before insert
-            if batch_data and len(batch_data) > 0:
-                first_rec = batch_data[0]
-                logger.info(f"DEBUG STORAGE: timing_advance={first_rec.get('timing_advance')}, run_time={first_rec.get('run_time')}, control_module_voltage={first_rec.get('control_module_voltage')}")
+            logger.info("✅ Stored %d readings for vehicle %s", len(batch_data), vehicle_id)
             
-            # Insert batch data
-            result = self.supabase_client.table('sensor_data').insert(batch_data).execute()
+            # Update real-time table
+            latest_reading = sensor_readings[-1]
+            self.update_realtime_data(vehicle_id, latest_reading)
+            self.update_vehicle_statistics(vehicle_id, len(batch_data))
             
-            if result.data:
-                logger.info(f"✅ Stored {len(batch_data)} readings for vehicle {vehicle_id}")
-                
-                # Update real-time table
-                latest_reading = sensor_readings[-1]
-                self.update_realtime_data(vehicle_id, latest_reading)
-                self.update_vehicle_statistics(vehicle_id, len(batch_data))
-                
-                return True
+            return True
                 
         except Exception as e:
             logger.error(f"Error storing sensor data: {e}")
@@ -238,12 +235,13 @@ class SupabaseDirectStorage:
             }
             
             # Upsert (insert or update if exists)
-            result = self.supabase_client.table('sensor_data_realtime').upsert(
+            self.supabase_client.table('sensor_data_realtime').upsert(
                 realtime_data, 
-                on_conflict='vehicle_id'
+                on_conflict='vehicle_id',
+                returning=ReturnMethod.minimal
             ).execute()
             
-            return bool(result.data)
+            return True
             
         except Exception as e:
             logger.error(f"Error updating real-time data: {e}")
@@ -253,16 +251,18 @@ class SupabaseDirectStorage:
         """Update vehicle statistics"""
         try:
             result = self.supabase_client.table('vehicle_profiles').select('total_records').eq('id', vehicle_id).execute()
+            if not result.data:
+                return
             
-            if result.data:
-                current_total = result.data[0].get('total_records', 0)
-                new_total = current_total + new_records_count
-                
-                self.supabase_client.table('vehicle_profiles').update({
-                    'total_records': new_total,
-                    'last_used': datetime.now(timezone.utc).isoformat(),
-                    'updated_at': datetime.now(timezone.utc).isoformat()
-                }).eq('id', vehicle_id).execute()
+            current_total = result.data[0].get('total_records') or 0
+            new_total = current_total + new_records_count
+            now_iso = datetime.now(timezone.utc).isoformat()
+            
+            self.supabase_client.table('vehicle_profiles').update({
+                'total_records': new_total,
+                'last_used': now_iso,
+                'updated_at': now_iso
+            }).eq('id', vehicle_id).execute()
                 
         except Exception as e:
             logger.error(f"Error updating stats: {e}")